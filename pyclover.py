@@ -7,10 +7,14 @@ clover_net_sales.py  – Version 12 (sales excluding tax, employee tip & discoun
   -q {sales,tax,tips,discounts}       (default: sales)
   -d                                  (detailed breakdown - employee tips, discount names, or sales by time)
   -g                                  (graph mode - only valid with -d, requires termgraph library)
+  --refresh                           (ignore cached responses; settled windows are otherwise reused for a day)
 
 • Quick listings
   -l {employees,discounts,items}
 
+• Server mode
+  -s [--port N]                       (answer /sales?range=today, /tips?detail=1, /list/items ... over HTTP)
+
 CONFIG  – ./config.json
 
 {
@@ -20,18 +24,41 @@ CONFIG  – ./config.json
 }
 """
 import argparse
+import functools
+import gzip
+import hashlib
+import io
 import json
+import os
 import sys
+import threading
 from pathlib import Path
 from datetime import datetime, time, timedelta, date, timezone
 from zoneinfo import ZoneInfo
 import requests
-from collections import defaultdict
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from bisect import bisect_right
+from collections import defaultdict, namedtuple
 import calendar
 import tempfile
 import subprocess
 import csv
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlsplit
+from typing import Iterable, Iterator, Optional
+
+# orjson decodes the large `elements` arrays several times faster; stdlib json is the fallback
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
 
 # ANSI color codes
 ANSI_RESET = '\033[0m'
@@ -42,21 +69,162 @@ ANSI_RED = '\033[31m'
 # Constants
 CONFIG_FILE = Path(__file__).with_name("config.json")
 PAGE_LIMIT = 1000
+PAGE_WINDOW = 8  # most pages fetched concurrently once the first page comes back full
+HTTP_TIMEOUT = (5, 30)  # (connect, read) seconds per request
+MONTH_WORKERS = 6  # monthly chunks of a long range fetched in parallel
+MAX_CONNECTIONS = 20  # cap on in-flight requests; matches the connection pool size
+MAP_CACHE_TTL = 3600  # seconds an employee/discount map or -l listing stays valid on disk
+NUMPY_MIN_ROWS = 2000  # below this, importing numpy costs more than it saves
+SERVE_PORT = 8765  # default localhost port for --serve
+RESPONSE_CACHE_DIR = Path.home() / ".cache" / "pyclover"
+RESPONSE_CACHE_VERSION = 1  # bump when the cached response shape changes
+OPEN_WINDOW_TTL = 300  # seconds a still-open (or just-closed) payment/order window may be served from cache
+SETTLE_DAYS = 7  # refunds and offline payments can still land this long after a window closes
+CLOSED_WINDOW_TTL = 86400  # seconds a settled window may be served from cache
 CENTRAL_TZ = ZoneInfo("America/Chicago")
+UTC = timezone.utc
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+HOUR_MS = 3_600_000
+DAY_MS = 86_400_000
+
+# Static query parameters; requests repeats list values (filter=...&filter=...) as Clover expects
+PAYMENT_FILTERS = ["result=SUCCESS", "voided=false"]
+# Expansions each payment query actually reads; every one inflates the response body
+PAYMENT_EXPANDS = {
+    "sales": ["refunds"],
+    "tax": [],
+    "tips": [],
+    "tips_detail": ["employee", "order.employee"],
+}
+ORDER_EXPANDS = ["discounts"]
+# Top-level keys the metrics read; everything else is dropped as pages arrive (and from the cache)
+PAYMENT_FIELDS = ("amount", "taxAmount", "tipAmount", "createdTime", "refunds", "employee", "order")
+ORDER_FIELDS = ("total", "createdTime", "discounts")
+
+# Shared HTTP session so paginated calls reuse one keep-alive connection to Clover.
+# Transient 429/5xx responses are retried with exponential backoff (honouring
+# Retry-After) instead of aborting the whole run.
+RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods={"GET"},
+    respect_retry_after_header=True,
+)
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=MAX_CONNECTIONS, max_retries=RETRY))
+# Nested month/page pools can ask for more than MAX_CONNECTIONS at once; the
+# semaphore keeps them within the pool so every request reuses a kept-alive socket.
+REQUEST_SLOTS = threading.BoundedSemaphore(MAX_CONNECTIONS)
+# After RATE_LIMIT_STRIKES consecutive responses that needed a 429 retry, half the
+# slots are held back for THROTTLE_SECONDS so the pools stop re-tripping the limit.
+RATE_LIMIT_STRIKES = 2
+THROTTLE_SECONDS = 60
+THROTTLE_LOCK = threading.Lock()
+rate_limit_strikes = 0
+throttled = False
 
 # Helpers
 
 def load_cfg(path: Path) -> dict:
     if not path.exists():
         sys.exit(f"❌  Config file {path} not found.")
-    return json.loads(path.read_text())
+    cfg = json_loads(path.read_bytes())
+    # Attach credentials to the shared session once rather than per request
+    SESSION.headers.update({"Authorization": f"Bearer {cfg['access_token']}"})
+    return cfg
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Best-effort atomic write: temp file in the same directory, then os.replace."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", dir=path.parent, delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+    except OSError:
+        pass  # caching is best-effort
+
+class Cache:
+    """gzip-compressed JSON entries in one directory, keyed by an arbitrary string."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.revalidate = False  # --refresh: ignore stored entries, refetch and overwrite them
+        self.refreshes = []  # background refresh threads still to be joined by wait()
+        self.lock = threading.Lock()
+
+    def path_for(self, key: str) -> Path:
+        digest = hashlib.blake2b(f"{RESPONSE_CACHE_VERSION}|{key}".encode(), digest_size=16).hexdigest()
+        return self.directory / f"{digest}.json.gz"
+
+    def get(self, key: str) -> Optional[tuple]:
+        """(value, age in seconds) for a stored entry, or None if missing or unreadable."""
+        path = self.path_for(key)
+        try:
+            age = datetime.now(UTC).timestamp() - path.stat().st_mtime
+            with gzip.open(path, "rb") as f:
+                return json_loads(f.read()), age
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, value) -> None:
+        write_atomic(self.path_for(key), gzip.compress(json_dumps(value)))
+
+    def fetch(self, key: str, loader, max_age: Optional[float] = None, stale_ok: bool = False):
+        """Cached value for `key`, calling loader() on a miss or when older than `max_age`
+        (None = never expires). With `stale_ok`, an expired entry is returned at once and
+        refreshed on a background thread (stale-while-revalidate)."""
+        return self.fetch_aged(key, loader, max_age, stale_ok)[0]
+
+    def fetch_aged(self, key: str, loader, max_age: Optional[float] = None, stale_ok: bool = False) -> tuple:
+        """fetch(), also returning the value's age in seconds (0 when just loaded)."""
+        hit = None if self.revalidate else self.get(key)
+        if hit is not None:
+            value, age = hit
+            if max_age is None or age < max_age:
+                return value, age
+            if stale_ok:
+                t = threading.Thread(target=self.refresh, args=(key, loader))
+                t.start()
+                with self.lock:
+                    self.refreshes = [r for r in self.refreshes if r.is_alive()] + [t]
+                return value, age
+        value = loader()
+        self.put(key, value)
+        return value, 0
+
+    def refresh(self, key: str, loader) -> None:
+        try:
+            self.put(key, loader())
+        except Exception:
+            pass  # keep serving the stale entry; the next run will try again
+
+    def wait(self) -> None:
+        """Block until background refreshes finish; call before the session is closed."""
+        with self.lock:
+            pending, self.refreshes = self.refreshes, []
+        for t in pending:
+            t.join()
+
+CACHE = Cache(RESPONSE_CACHE_DIR)
 
 def epoch_ms(dt: datetime) -> int:
-    return int(dt.astimezone(timezone.utc).timestamp() * 1000)
+    # timestamp() already honours tzinfo on aware datetimes; no astimezone() hop needed
+    return int(dt.timestamp() * 1000)
 
 def sunday_of_week(d: date) -> date:
     return d - timedelta(days=(d.weekday() + 1) % 7)
 
+@functools.lru_cache(maxsize=4096)
+def central_ms(d: date, hour: int) -> int:
+    """Epoch ms of `hour`:00 Central on `d`; only the UTC offset needs a zoneinfo lookup."""
+    offset = datetime.combine(d, time(hour, 0), tzinfo=CENTRAL_TZ).utcoffset()
+    return (d.toordinal() - EPOCH_ORDINAL) * DAY_MS + hour * HOUR_MS - int(offset.total_seconds()) * 1000
+
+def business_window_ms(s: date, e: date) -> tuple[int, int]:
+    """Epoch-ms bounds from 12 p.m. CT on `s` up to midnight CT ending `e`."""
+    return central_ms(s, 12), central_ms(e + timedelta(days=1), 0)
+
 def create_termgraph(data: dict, title: str, value_suffix: str = "", threshold: Optional[int] = None) -> None:
     """Create and display a terminal bar graph using unicode full block (U+2587), with optional color thresholding."""
     if not data:
@@ -101,7 +269,10 @@ def create_termgraph(data: dict, title: str, value_suffix: str = "", threshold:
         print(f"{label.ljust(label_width)} | {color}{bar.ljust(max_bar_width)}{ANSI_RESET} {value_fmt.format(value)}{suffix}")
 
 def window(range_key: str):
-    today = datetime.now(CENTRAL_TZ).date()
+    return window_on(range_key, datetime.now(CENTRAL_TZ).date())
+
+@functools.lru_cache(maxsize=16)
+def window_on(range_key: str, today: date):
 
     # Check for discrete date range format: YYYY-MM-DD:YYYY-MM-DD
     if ':' in range_key:
@@ -113,9 +284,7 @@ def window(range_key: str):
             if s > e:
                 sys.exit(f"❌  Start date ({s}) cannot be after end date ({e})")
             
-            start_dt = datetime.combine(s, time(12, 0), tzinfo=CENTRAL_TZ)
-            end_dt = datetime.combine(e + timedelta(days=1), time(0, 0), tzinfo=CENTRAL_TZ)
-            return epoch_ms(start_dt), epoch_ms(end_dt), s, e, "range"
+            return (*business_window_ms(s, e), s, e, "range")
         except ValueError as ex:
             sys.exit(f"❌  Invalid date range format '{range_key}'. Use YYYY-MM-DD:YYYY-MM-DD. Error: {ex}")
 
@@ -124,18 +293,14 @@ def window(range_key: str):
         year = today.year
         s = date(year, 1, 1)
         e = date(year, 12, 31)
-        start_dt = datetime.combine(s, time(12, 0), tzinfo=CENTRAL_TZ)
-        end_dt = datetime.combine(e + timedelta(days=1), time(0, 0), tzinfo=CENTRAL_TZ)
-        return epoch_ms(start_dt), epoch_ms(end_dt), s, e, "year"
+        return (*business_window_ms(s, e), s, e, "year")
     
     try:
         year = int(range_key)
         if 2000 <= year <= 2099:  # Reasonable year range
             s = date(year, 1, 1)
             e = date(year, 12, 31)
-            start_dt = datetime.combine(s, time(12, 0), tzinfo=CENTRAL_TZ)
-            end_dt = datetime.combine(e + timedelta(days=1), time(0, 0), tzinfo=CENTRAL_TZ)
-            return epoch_ms(start_dt), epoch_ms(end_dt), s, e, "year"
+            return (*business_window_ms(s, e), s, e, "year")
     except ValueError:
         pass
 
@@ -177,355 +342,471 @@ def window(range_key: str):
     else:
         sys.exit(f"❌  Unknown range or bad date '{range_key}'.")
     
-    start_dt = datetime.combine(s, time(12, 0), tzinfo=CENTRAL_TZ)
-    end_dt = datetime.combine(e + timedelta(days=1), time(0, 0), tzinfo=CENTRAL_TZ)
-    return epoch_ms(start_dt), epoch_ms(end_dt), s, e, range_type
-
-def paged_get(cfg: dict, path: str) -> list[dict]:
-    base = cfg.get("base_url", "https://api.clover.com")
-    tok = cfg["access_token"]
-    out, offset = [], 0
-    while True:
-        url = f"{base}{path}&limit={PAGE_LIMIT}&offset={offset}"
-        r = requests.get(url, headers={"Authorization": f"Bearer {tok}"})
-        r.raise_for_status()
-        batch = r.json().get("elements", [])
-        if not batch:
-            break
-        out.extend(batch)
-        if len(batch) < PAGE_LIMIT:
-            break
-        offset += PAGE_LIMIT
-    return out
+    return (*business_window_ms(s, e), s, e, range_type)
+
+def throttle_if_rate_limited(r: requests.Response) -> None:
+    """Count consecutive rate-limited responses and halve concurrency once there are enough.
+
+    RETRY already waits out Retry-After per request; this only kicks in when the
+    page and month pools keep tripping the limit."""
+    global rate_limit_strikes, throttled
+    retries = getattr(r.raw, "retries", None)
+    limited = retries is not None and any(h.status == 429 for h in retries.history)
+    with THROTTLE_LOCK:
+        rate_limit_strikes = rate_limit_strikes + 1 if limited else 0
+        if throttled or rate_limit_strikes < RATE_LIMIT_STRIKES:
+            return
+        throttled = True
+    # Slots are taken as in-flight requests finish; the daemon thread never blocks exit
+    threading.Thread(target=hold_back_slots, daemon=True).start()
+
+def hold_back_slots() -> None:
+    """Take half the request slots and schedule their release after THROTTLE_SECONDS."""
+    for _ in range(MAX_CONNECTIONS // 2):
+        REQUEST_SLOTS.acquire()
+    timer = threading.Timer(THROTTLE_SECONDS, release_slots)
+    timer.daemon = True
+    timer.start()
+
+def release_slots() -> None:
+    global rate_limit_strikes, throttled
+    for _ in range(MAX_CONNECTIONS // 2):
+        REQUEST_SLOTS.release()
+    with THROTTLE_LOCK:
+        rate_limit_strikes = 0
+        throttled = False
+
+def get_page(url: str, params: dict, offset: int) -> dict:
+    with REQUEST_SLOTS:
+        r = SESSION.get(url, params={**params, "offset": offset}, timeout=HTTP_TIMEOUT)
+    throttle_if_rate_limited(r)
+    r.raise_for_status()
+    page = json_loads(r.content)
+    # Some endpoints report the total as a header rather than in the body
+    total = r.headers.get("X-Clover-Total", "")
+    if total.isdigit():
+        page.setdefault("totalCount", int(total))
+    return page
+
+def paged_iter(cfg: dict, path: str, params: Optional[dict] = None,
+               fields: Optional[tuple] = None) -> Iterator[dict]:
+    """Yield elements page by page; only the pages currently in flight are held in memory.
+
+    With `fields`, each element is cut down to those top-level keys as its page arrives."""
+    url = cfg.get("base_url", "https://api.clover.com") + path
+    params = {**(params or {}), "limit": PAGE_LIMIT}
+
+    def elements(page: dict) -> list[dict]:
+        batch = page.get("elements", [])
+        if fields:
+            batch = [{k: e[k] for k in fields if k in e} for e in batch]
+        return batch
+
+    first = get_page(url, params, 0)
+    batch = elements(first)
+    yield from batch
+    if len(batch) < PAGE_LIMIT:
+        return
+
+    # More pages exist. If the response carries a total count, request every
+    # page it accounts for in one go; then (or without a count) probe speculatively
+    # in growing windows and stop at the first short (or empty) page.
+    fetch = lambda o: elements(get_page(url, params, o))
+    with ThreadPoolExecutor(max_workers=PAGE_WINDOW) as pool:
+        offset, width = PAGE_LIMIT, 2
+        total = first.get("totalCount")
+        if isinstance(total, int) and total > PAGE_LIMIT:
+            offsets = range(PAGE_LIMIT, total, PAGE_LIMIT)
+            for batch in pool.map(fetch, offsets):
+                yield from batch
+            # In an open window new rows can push older ones past the count
+            if len(batch) < PAGE_LIMIT:
+                return
+            offset = offsets[-1] + PAGE_LIMIT
+
+        # Windows double (2, 4, 8, ...) up to PAGE_WINDOW so short listings,
+        # like most monthly chunks, don't pay for a full window of empty pages
+        while True:
+            offsets = range(offset, offset + width * PAGE_LIMIT, PAGE_LIMIT)
+            for batch in pool.map(fetch, offsets):
+                yield from batch
+                if len(batch) < PAGE_LIMIT:
+                    return
+            offset += width * PAGE_LIMIT
+            width = min(width * 2, PAGE_WINDOW)
+
+def paged_get(cfg: dict, path: str, params: Optional[dict] = None, max_age: float = 0,
+              fields: Optional[tuple] = None) -> list[dict]:
+    """All elements for a listing, via the on-disk cache for up to `max_age` seconds
+    (0 = always fetch)."""
+    if max_age == 0:
+        return list(paged_iter(cfg, path, params, fields))
+    key = repr((cfg.get("base_url"), path, sorted((params or {}).items()), fields))
+    return CACHE.fetch(key, lambda: list(paged_iter(cfg, path, params, fields)), max_age)
+
+def window_max_age(end_ms: int, now_ms: int) -> float:
+    """Cache lifetime for a payment/order window. Closed windows still change (late refunds,
+    offline payments syncing), so they stay short-lived until SETTLE_DAYS have passed and
+    are re-checked daily after that."""
+    return CLOSED_WINDOW_TTL if end_ms + SETTLE_DAYS * DAY_MS < now_ms else OPEN_WINDOW_TTL
+
+def fetch_chunks(cfg: dict, path: str, chunks: list[tuple[dict, Optional[float]]],
+                 fields: Optional[tuple] = None) -> list[dict]:
+    """Fetch independent (params, max_age) chunks of one endpoint in parallel and flatten them."""
+    with ThreadPoolExecutor(max_workers=MONTH_WORKERS) as pool:
+        results = pool.map(lambda c: paged_get(cfg, path, *c, fields=fields), chunks)
+        return list(chain.from_iterable(results))
 
 # Data fetch
 
-def get_payments(cfg: dict, start_ms: int, end_ms: int) -> list[dict]:
-    mid = cfg["merchant_id"]
-    
-    # For large date ranges (more than 90 days), chunk the requests
-    start_dt = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc)
-    end_dt = datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc)
-    days_diff = (end_dt - start_dt).days
-    
-    if days_diff > 90:
-        # Chunk into monthly requests for large ranges
-        all_payments = []
-        
-        # Convert back to Central Time dates for proper chunking
-        start_central = start_dt.astimezone(CENTRAL_TZ)
-        end_central = end_dt.astimezone(CENTRAL_TZ)
-        
-        # Start with first day of the year/range
-        current_date = start_central.date()
-        end_date = end_central.date()
-        
-        while current_date <= end_date:
-            # Get end of current month or end_date, whichever is earlier
-            if current_date.month == 12:
-                next_month_start = date(current_date.year + 1, 1, 1)
-            else:
-                next_month_start = date(current_date.year, current_date.month + 1, 1)
-            
-            # Last day of current month or end_date
-            month_end = min(next_month_start - timedelta(days=1), end_date)
-            
-            # Create proper 12pm-12am windows for this month
-            chunk_start_dt = datetime.combine(current_date, time(12, 0), tzinfo=CENTRAL_TZ)
-            chunk_end_dt = datetime.combine(month_end + timedelta(days=1), time(0, 0), tzinfo=CENTRAL_TZ)
-            
-            chunk_start_ms = epoch_ms(chunk_start_dt)
-            chunk_end_ms = epoch_ms(chunk_end_dt)
-            
-            path = (
-                f"/v3/merchants/{mid}/payments"
-                f"?filter=createdTime>={chunk_start_ms}"
-                f"&filter=createdTime<{chunk_end_ms}"
-                f"&filter=result=SUCCESS"
-                f"&filter=voided=false"
-                f"&expand=refunds"
-                f"&expand=order"
-                f"&expand=employee"
-                f"&expand=order.employee"
-            )
-            
-            chunk_payments = paged_get(cfg, path)
-            all_payments.extend(chunk_payments)
-            current_date = next_month_start
-            
-        return all_payments
-    else:
-        # Normal single request for smaller ranges
-        path = (
-            f"/v3/merchants/{mid}/payments"
-            f"?filter=createdTime>{start_ms}"
-            f"&filter=createdTime<{end_ms}"
-            f"&filter=result=SUCCESS"
-            f"&filter=voided=false"
-            f"&expand=refunds"
-            f"&expand=order"
-            f"&expand=employee"
-            f"&expand=order.employee"
-        )
-        return paged_get(cfg, path)
-
-def get_orders(cfg: dict, start_ms: int, end_ms: int) -> list[dict]:
-    mid = cfg["merchant_id"]
+def merchant_path(cfg: dict, resource: str) -> str:
+    return f"/v3/merchants/{cfg['merchant_id']}/{resource}"
+
+def iter_month_chunks(start: date, end: date) -> Iterator[tuple[date, int, int]]:
+    """(month, start_ms, end_ms) pieces that exactly tile business_window_ms(start, end),
+    split at 12 p.m. CT on the first of each month."""
+    chunk_start_ms, end_ms = business_window_ms(start, end)
+    y, m = start.year, start.month
+    while True:
+        last = date(y, m, calendar.monthrange(y, m)[1])
+        if last >= end:
+            yield date(y, m, 1), chunk_start_ms, end_ms
+            return
+        nxt = last + timedelta(days=1)
+        nxt_ms = central_ms(nxt, 12)
+        yield date(y, m, 1), chunk_start_ms, nxt_ms
+        chunk_start_ms, y, m = nxt_ms, nxt.year, nxt.month
+
+def get_payments(cfg: dict, start: date, end: date, expand: Iterable[str] = ()) -> list[dict]:
+    """Payments in the business window for `start`..`end` (Central dates)."""
+    path = merchant_path(cfg, "payments")
+    now_ms = epoch_ms(datetime.now(UTC))
+    expand = list(expand)
     
-    # For large date ranges (more than 90 days), chunk the requests
-    start_dt = datetime.fromtimestamp(start_ms / 1000, tz=timezone.utc)
-    end_dt = datetime.fromtimestamp(end_ms / 1000, tz=timezone.utc)
-    days_diff = (end_dt - start_dt).days
+    # For large date ranges (more than 90 days), fetch month by month in parallel
+    if (end - start).days > 90:
+        chunks = [
+            ({"filter": [f"createdTime>={s_ms}", f"createdTime<{e_ms}", *PAYMENT_FILTERS], "expand": expand},
+             window_max_age(e_ms, now_ms))
+            for _, s_ms, e_ms in iter_month_chunks(start, end)
+        ]
+        return fetch_chunks(cfg, path, chunks, PAYMENT_FIELDS)
+
+    start_ms, end_ms = business_window_ms(start, end)
+    params = {
+        "filter": [f"createdTime>{start_ms}", f"createdTime<{end_ms}", *PAYMENT_FILTERS],
+        "expand": expand,
+    }
+    return paged_get(cfg, path, params, window_max_age(end_ms, now_ms), PAYMENT_FIELDS)
+
+def get_orders(cfg: dict, start: date, end: date) -> list[dict]:
+    """Orders in the business window for `start`..`end` (Central dates)."""
+    path = merchant_path(cfg, "orders")
+    now_ms = epoch_ms(datetime.now(UTC))
     
-    if days_diff > 90:
-        # Chunk into monthly requests for large ranges
-        all_orders = []
-        current_dt = start_dt
-        
-        while current_dt < end_dt:
-            # Get end of current month or end_dt, whichever is earlier
-            if current_dt.month == 12:
-                next_month = current_dt.replace(year=current_dt.year + 1, month=1, day=1)
-            else:
-                next_month = current_dt.replace(month=current_dt.month + 1, day=1)
-            
-            chunk_end = min(next_month, end_dt)
-            chunk_start_ms = int(current_dt.timestamp() * 1000)
-            chunk_end_ms = int(chunk_end.timestamp() * 1000)
-            
-            print(f"Fetching orders for {current_dt.strftime('%Y-%m')}...")
-            
-            path = (
-                f"/v3/merchants/{mid}/orders"
-                f"?filter=createdTime>{chunk_start_ms}"
-                f"&filter=createdTime<{chunk_end_ms}"
-                f"&expand=discounts"
-                f"&expand=lineItems"
-            )
-            
-            chunk_orders = paged_get(cfg, path)
-            all_orders.extend(chunk_orders)
-            current_dt = next_month
-            
-        return all_orders
-    else:
-        # Normal single request for smaller ranges
-        path = (
-            f"/v3/merchants/{mid}/orders"
-            f"?filter=createdTime>{start_ms}"
-            f"&filter=createdTime<{end_ms}"
-            f"&expand=discounts"
-            f"&expand=lineItems"
-        )
-        return paged_get(cfg, path)
+    # For large date ranges (more than 90 days), fetch month by month in parallel
+    if (end - start).days > 90:
+        chunks = []
+        for month, s_ms, e_ms in iter_month_chunks(start, end):
+            print(f"Fetching orders for {month:%Y-%m}...")
+            params = {"filter": [f"createdTime>={s_ms}", f"createdTime<{e_ms}"], "expand": ORDER_EXPANDS}
+            chunks.append((params, window_max_age(e_ms, now_ms)))
+        return fetch_chunks(cfg, path, chunks, ORDER_FIELDS)
+
+    start_ms, end_ms = business_window_ms(start, end)
+    params = {
+        "filter": [f"createdTime>{start_ms}", f"createdTime<{end_ms}"],
+        "expand": ORDER_EXPANDS,
+    }
+    return paged_get(cfg, path, params, window_max_age(end_ms, now_ms), ORDER_FIELDS)
 
 # Mapping helpers
+def disk_cache(name: str, ttl_seconds: int = MAP_CACHE_TTL):
+    """Cache a cfg -> dict builder in CACHE, one entry per merchant.
+
+    Entries older than `ttl_seconds` are still served, then refreshed in the background.
+    A fresh result is also kept in memory, until it reaches the same age, so a long-running
+    --serve process skips the disk; stale entries are not memoized, so the background
+    refresh is picked up on the next call."""
+    def decorator(func):
+        memo = {}  # key -> (map, loaded at)
+
+        @functools.wraps(func)
+        def wrapper(cfg: dict) -> dict:
+            key = f"{name}|{cfg['merchant_id']}"
+            now = datetime.now(UTC).timestamp()
+            hit = memo.get(key)
+            if hit is not None and now - hit[1] < ttl_seconds and not CACHE.revalidate:
+                return hit[0]
+            value, age = CACHE.fetch_aged(key, lambda: func(cfg), ttl_seconds, stale_ok=True)
+            if age < ttl_seconds:
+                memo[key] = (value, now - age)
+            return value
+        return wrapper
+    return decorator
+
+@disk_cache("employees.json")
 def build_employee_map(cfg: dict) -> dict:
-    mid = cfg["merchant_id"]
-    emps = paged_get(cfg, f"/v3/merchants/{mid}/employees?")
+    emps = paged_get(cfg, merchant_path(cfg, "employees"))
     return {e.get("id"): e.get("name", e.get("id")) for e in emps}
 
+@disk_cache("discounts.json")
 def build_discount_map(cfg: dict) -> dict:
-    mid = cfg["merchant_id"]
-    discs = paged_get(cfg, f"/v3/merchants/{mid}/discounts?")
+    discs = paged_get(cfg, merchant_path(cfg, "discounts"))
     return {d.get("id"): d.get("name", d.get("id")) for d in discs}
 
+def fetch_concurrently(*calls) -> list:
+    """Run independent fetches side by side; each call is a (func, *args) tuple."""
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = [pool.submit(func, *fargs) for func, *fargs in calls]
+        return [f.result() for f in futures]
+
 # Metrics
-def net_sales_cents(payments: list[dict]) -> int:
-    gross = sum(p.get("amount", 0) for p in payments)
-    tax = sum(p.get("taxAmount", 0) for p in payments)
-    refunds = sum(
-        ref.get("amount", 0)
-        for p in payments
-        for ref in (p.get("refunds", {}).get("elements", []) if p.get("refunds") else [])
-    )
-    return gross - tax - refunds
+@functools.cache
+def optional_numpy():
+    """Import numpy on first use; None when it is not installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def payment_employee_id(p: dict) -> Optional[str]:
+    """Employee id on the payment itself, falling back to the order's employee."""
+    e = p.get("employee")
+    if not (e and isinstance(e, dict)):
+        e = o.get("employee") if isinstance(o := p.get("order"), dict) else None
+    return e.get("id") if isinstance(e, dict) else None
 
-def total_tax_cents(payments: list[dict]) -> int:
-    return sum(p.get("taxAmount", 0) for p in payments)
+Agg = namedtuple("Agg", "gross tax tips refunds per_hour per_day per_month per_employee")
 
-def total_tips_cents(payments: list[dict]) -> int:
-    return sum(p.get("tipAmount", 0) for p in payments)
+def aggregate(payments: Iterable[dict], *, by: Optional[str] = None, start: Optional[date] = None,
+              end: Optional[date] = None, employee_map: Optional[dict] = None) -> Agg:
+    """Walk the payments exactly once, returning the totals plus at most one breakdown.
 
-def tips_by_employee(payments: list[dict], employee_map: dict) -> dict:
-    emap = {}
+    `by` selects the breakdown: "hour" (business hours of day `start`), "day"
+    (`start`..`end`), "month" (calendar year of `start`) or "employee" (tips,
+    named through `employee_map`). Net sales = gross - tax - refunds.
+    """
+    if by in ("hour", "day", "month") and isinstance(payments, list) and len(payments) > NUMPY_MIN_ROWS:
+        np = optional_numpy()
+        if np is not None:
+            return aggregate_numpy(np, payments, by, start, end)
+
+    gross = tax = tips = refunds = 0
+    buckets, per_employee = defaultdict(int), defaultdict(int)
+    bucket_of = business_bucketer(by, start, end) if by in ("hour", "day", "month") else None
     for p in payments:
-        amt = p.get("tipAmount", 0)
-        if amt <= 0:
+        get = p.get
+        amount = get("amount", 0)
+        tax_amt = get("taxAmount", 0)
+        tip = get("tipAmount", 0)
+        refund = 0
+        r = get("refunds")
+        if r:
+            for ref in r.get("elements", ()):
+                refund += ref.get("amount", 0)
+        gross += amount
+        tax += tax_amt
+        tips += tip
+        refunds += refund
+
+        if by is None:
+            continue
+        if by == "employee":
+            if tip > 0:
+                emp_id = payment_employee_id(p)
+                per_employee[employee_map.get(emp_id, emp_id) if emp_id else "Unknown Employee"] += tip
             continue
-        emp_id = None
-        if p.get("employee") and isinstance(p["employee"], dict):
-            emp_id = p["employee"].get("id")
-        elif p.get("order") and p["order"].get("employee") and isinstance(p["order"]["employee"], dict):
-            emp_id = p["order"]["employee"].get("id")
-        name = employee_map.get(emp_id, emp_id) if emp_id else "Unknown Employee"
-        emap[name] = emap.get(name, 0) + amt
-    return emap
-
-def total_discounts_cents(orders: list[dict]) -> int:
-    return sum(d.get("amount", 0) for o in orders for d in o.get("discounts", {}).get("elements", []))
+        created_time = get("createdTime")
+        if created_time:
+            key = bucket_of(created_time)
+            if key is not None:
+                buckets[key] += amount - tax_amt - refund
+
+    if by == "day":
+        buckets = {start + timedelta(days=k): v for k, v in buckets.items()}
+    return make_agg(gross, tax, tips, refunds, by, dict(buckets), dict(per_employee))
+
+def central_offsets(start_ms: int, end_ms: int) -> tuple[list[int], list[int]]:
+    """UTC-ms boundaries covering start_ms..end_ms and the Central UTC offset (ms) in force
+    from each one; Chicago changes offset at most twice a year, on the hour."""
+    offset_at = lambda ms: int(datetime.fromtimestamp(ms / 1000, tz=CENTRAL_TZ).utcoffset().total_seconds()) * 1000
+    t = start_ms - start_ms % HOUR_MS
+    bounds, offsets = [t], [offset_at(t)]
+    while t <= end_ms:
+        nxt = t + DAY_MS
+        if offset_at(nxt) != offsets[-1]:
+            # Offset changed during this day: find the hour it happened
+            nxt = t + HOUR_MS
+            while offset_at(nxt) == offsets[-1]:
+                nxt += HOUR_MS
+            bounds.append(nxt)
+            offsets.append(offset_at(nxt))
+        t = nxt
+    return bounds, offsets
+
+def business_bucketer(by: str, start: date, end: Optional[date]):
+    """created_ms -> breakdown key (or None) using integer math on a precomputed DST offset table.
+
+    "hour": 12-23 on `start`, or 24 for the midnight after it; "day": days from `start` to a
+    business date within `start`..`end`; "month": month of a business date in `start`'s year.
+    Payments before 12 p.m. belong to the previous business day.
+    """
+    start_day = start.toordinal() - EPOCH_ORDINAL
+    last_day = {"hour": start_day + 1, "day": (end or start).toordinal() - EPOCH_ORDINAL + 1,
+                "month": date(start.year + 1, 1, 1).toordinal() - EPOCH_ORDINAL + 1}[by]
+    # Pad by a day either side so every timestamp that can land in a bucket is covered exactly
+    bounds, offsets = central_offsets((start_day - 1) * DAY_MS, (last_day + 1) * DAY_MS)
+
+    def local_day_hour(created_ms: int) -> tuple[int, int]:
+        i = bisect_right(bounds, created_ms) - 1
+        day, rem = divmod(created_ms + offsets[i if i > 0 else 0], DAY_MS)
+        return day, rem // HOUR_MS
+
+    if by == "hour":
+        def bucket(created_ms):
+            day, hour = local_day_hour(created_ms)
+            if day == start_day and hour >= 12:
+                return hour
+            if day == start_day + 1 and hour == 0:
+                return 24
+            return None
+    elif by == "day":
+        span = last_day - 1 - start_day
+        def bucket(created_ms):
+            day, hour = local_day_hour(created_ms)
+            k = day - (hour < 12) - start_day
+            return k if 0 <= k <= span else None
+    else:
+        month_starts = [date(start.year, m, 1).toordinal() - EPOCH_ORDINAL for m in range(1, 13)]
+        month_starts.append(last_day - 1)
+        def bucket(created_ms):
+            day, hour = local_day_hour(created_ms)
+            m = bisect_right(month_starts, day - (hour < 12))
+            return m if 1 <= m <= 12 else None
+    return bucket
+
+def aggregate_numpy(np, payments: list[dict], by: str, start: date, end: Optional[date]) -> Agg:
+    """aggregate() for large lists: one extraction pass, then vectorised time bucketing and np.bincount."""
+    amounts, taxes, tips, refunds, created = [], [], [], [], []
+    for p in payments:
+        get = p.get
+        amounts.append(get("amount", 0))
+        taxes.append(get("taxAmount", 0))
+        tips.append(get("tipAmount", 0))
+        created.append(get("createdTime") or 0)
+        refund = 0
+        r = get("refunds")
+        if r:
+            for ref in r.get("elements", ()):
+                refund += ref.get("amount", 0)
+        refunds.append(refund)
+    amounts, taxes, tips, refunds, created = (
+        np.asarray(a, dtype=np.int64) for a in (amounts, taxes, tips, refunds, created)
+    )
+    net = amounts - taxes - refunds
+    has_time = created > 0
+    net, created = net[has_time], created[has_time]
+
+    # Shift UTC timestamps to Central wall-clock time using the few DST segments in range
+    buckets = {}
+    if created.size:
+        bounds, offsets = central_offsets(int(created.min()), int(created.max()))
+        local = created + np.asarray(offsets, dtype=np.int64)[np.searchsorted(bounds, created, side="right") - 1]
+        local_day = local // DAY_MS  # days since 1970-01-01, Central calendar
+        local_hour = (local // HOUR_MS) % 24
+        start_day = start.toordinal() - EPOCH_ORDINAL
+        if by == "hour":
+            keys = np.where((local_day == start_day) & (local_hour >= 12), local_hour,
+                            np.where((local_day == start_day + 1) & (local_hour == 0), 24, -1))
+        else:
+            # Payments before 12 p.m. belong to the previous business day
+            business_day = local_day - (local_hour < 12)
+            if by == "day":
+                end_day = end.toordinal() - EPOCH_ORDINAL
+                keys = np.where((business_day >= start_day) & (business_day <= end_day), business_day - start_day, -1)
+            else:
+                month_starts = [date(start.year, m, 1).toordinal() - EPOCH_ORDINAL for m in range(1, 13)]
+                month_starts.append(date(start.year + 1, 1, 1).toordinal() - EPOCH_ORDINAL)
+                keys = np.searchsorted(month_starts, business_day, side="right")
+                keys[(business_day < month_starts[0]) | (business_day >= month_starts[-1])] = -1
+
+        mask = keys >= 0
+        idx = keys[mask]
+        # float64 weights are exact for any realistic cents total (< 2**53)
+        sums = np.bincount(idx, weights=net[mask])
+        for i in np.flatnonzero(np.bincount(idx)):
+            key = start + timedelta(days=int(i)) if by == "day" else int(i)
+            buckets[key] = int(round(sums[i]))
+
+    return make_agg(int(amounts.sum()), int(taxes.sum()), int(tips.sum()), int(refunds.sum()), by, buckets, {})
+
+def make_agg(gross: int, tax: int, tips: int, refunds: int, by: Optional[str], buckets: dict, per_employee: dict) -> Agg:
+    return Agg(gross, tax, tips, refunds,
+               buckets if by == "hour" else {},
+               buckets if by == "day" else {},
+               buckets if by == "month" else {},
+               per_employee)
+
+def total_discounts_cents(orders: Iterable[dict]) -> int:
+    total = 0
+    for o in orders:
+        discs = o.get("discounts")
+        if discs:
+            for d in discs.get("elements", ()):
+                total += d.get("amount", 0)
+    return total
 
 # Discount breakdown using discount map for all definitions
 def discounts_breakdown(orders: list[dict], discount_map: dict) -> dict:
-    dmap = {}
+    dmap = defaultdict(int)
     for o in orders:
+        if not (discs := o.get("discounts")):
+            continue
         # Get order total for percentage calculations
         order_total = o.get("total", 0)
-        
-        for d in o.get("discounts", {}).get("elements", []):
+
+        for d in discs.get("elements", ()):
             # Use the name directly from the discount if available
             name = d.get("name", "Unknown Discount")
             
             # If name is generic "Discount", try to get more specific name from discount map
             if name == "Discount":
-                did = None
-                if isinstance(d.get("discount"), dict):
-                    did = d["discount"].get("id")
-                elif d.get("discountDefinitionId"):
-                    did = d.get("discountDefinitionId")
-                elif d.get("discountId"):
-                    did = d.get("discountId")
-                
+                if isinstance(disc := d.get("discount"), dict):
+                    did = disc.get("id")
+                else:
+                    did = d.get("discountDefinitionId") or d.get("discountId")
+
                 if did and did in discount_map:
                     name = discount_map[did]
                 else:
                     name = "Manual Discount"
             
-            # Calculate discount amount
-            amount = 0
-            if d.get("amount"):
-                # Fixed amount discount
-                amount = d.get("amount", 0)
-            elif d.get("percentage") and order_total > 0:
-                # Percentage-based discount - calculate from order total
-                percentage = d.get("percentage", 0)
-                # Calculate percentage discount (negative because it's a discount)
-                amount = -int((order_total * percentage) / 100)
-            
-            dmap[name] = dmap.get(name, 0) + amount
-    return dmap
-
-# Sales breakdown functions
-def sales_by_hour(payments: list[dict], target_date: date) -> dict:
-    """Break down sales by hour for a single day"""
-    hourly_sales = defaultdict(int)
-    
-    for p in payments:
-        created_time = p.get("createdTime")
-        if not created_time:
-            continue
-            
-        # Convert timestamp to Central Time
-        dt = datetime.fromtimestamp(created_time / 1000, tz=timezone.utc).astimezone(CENTRAL_TZ)
-        
-        # Only include payments from the target date between 12pm-12am
-        if dt.date() == target_date:
-            if dt.hour >= 12:  # 12pm to 11:59pm
-                hour_key = dt.hour
-            else:
-                continue  # Skip payments before 12pm
-        elif dt.date() == target_date + timedelta(days=1) and dt.hour == 0:
-            # Include midnight (12am) of next day
-            hour_key = 24  # Use 24 to represent midnight
-        else:
-            continue
-            
-        # Calculate net sales for this payment
-        gross = p.get("amount", 0)
-        tax = p.get("taxAmount", 0)
-        refunds = sum(
-            ref.get("amount", 0)
-            for ref in (p.get("refunds", {}).get("elements", []) if p.get("refunds") else [])
-        )
-        net_sales = gross - tax - refunds
-        hourly_sales[hour_key] += net_sales
-    
-    return hourly_sales
-
-def sales_by_day(payments: list[dict], start_date: date, end_date: date) -> dict:
-    """Break down sales by day for a date range"""
-    daily_sales = defaultdict(int)
-    
-    for p in payments:
-        created_time = p.get("createdTime")
-        if not created_time:
-            continue
-            
-        # Convert timestamp to Central Time
-        dt = datetime.fromtimestamp(created_time / 1000, tz=timezone.utc).astimezone(CENTRAL_TZ)
-        
-        # Adjust for 12pm-12am window
-        payment_date = dt.date()
-        if dt.hour < 12:  # Before 12pm, count as previous day
-            payment_date = payment_date - timedelta(days=1)
-            
-        # Only include payments within our date range
-        if not (start_date <= payment_date <= end_date):
-            continue
-            
-        # Calculate net sales for this payment
-        gross = p.get("amount", 0)
-        tax = p.get("taxAmount", 0)
-        refunds = sum(
-            ref.get("amount", 0)
-            for ref in (p.get("refunds", {}).get("elements", []) if p.get("refunds") else [])
-        )
-        net_sales = gross - tax - refunds
-        daily_sales[payment_date] += net_sales
-    
-    return daily_sales
-
-def sales_by_month(payments: list[dict], year: int) -> dict:
-    """Break down sales by month for a year"""
-    monthly_sales = defaultdict(int)
-    
-    for p in payments:
-        created_time = p.get("createdTime")
-        if not created_time:
-            continue
-            
-        # Convert timestamp to Central Time
-        dt = datetime.fromtimestamp(created_time / 1000, tz=timezone.utc).astimezone(CENTRAL_TZ)
-        
-        # Adjust for 12pm-12am window
-        payment_date = dt.date()
-        if dt.hour < 12:  # Before 12pm, count as previous day
-            payment_date = payment_date - timedelta(days=1)
+            # Calculate discount amount: fixed amount if present
+            amount = d.get("amount") or 0
+            if not amount and (percentage := d.get("percentage")) and order_total > 0:
+                # Percentage-based discount from the order total (negative because it's a discount);
+                # integer floor division keeps large totals exact with no float round-trip
+                amount = -(order_total * percentage // 100)
             
-        # Only include payments from the target year
-        if payment_date.year != year:
-            continue
-            
-        # Calculate net sales for this payment
-        gross = p.get("amount", 0)
-        tax = p.get("taxAmount", 0)
-        refunds = sum(
-            ref.get("amount", 0)
-            for ref in (p.get("refunds", {}).get("elements", []) if p.get("refunds") else [])
-        )
-        net_sales = gross - tax - refunds
-        monthly_sales[payment_date.month] += net_sales
-    
-    return monthly_sales
+            dmap[name] += amount
+    return dict(dmap)
 
 # Listings
 def list_resource(cfg: dict, resource: str) -> None:
-    mid = cfg["merchant_id"]
-    if resource == "employees":
-        path, key = f"/v3/merchants/{mid}/employees?", "name"
-    elif resource == "discounts":
-        path, key = f"/v3/merchants/{mid}/discounts?", "name"
-    elif resource == "items":
-        path, key = f"/v3/merchants/{mid}/items?", "name"
-    else:
+    if resource not in ("employees", "discounts", "items"):
         sys.exit("❌  List option must be: employees, discounts, items")
-    rows = paged_get(cfg, path)
-    print(f"{resource.capitalize()} ({len(rows)}):")
-    for r in rows:
-        print(f"• {r.get(key)}   [{r.get('id')}] ")
+    key = "name"
+    # Rosters, discount definitions and menus rarely change; reuse a listing for up to an hour
+    rows = paged_get(cfg, merchant_path(cfg, resource), max_age=MAP_CACHE_TTL)
+    sys.stdout.write("".join([
+        f"{resource.capitalize()} ({len(rows)}):\n",
+        *(f"• {r.get(key)}   [{r.get('id')}] \n" for r in rows),
+    ]))
 
 # Main
-def main():
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Clover net metrics (sales, tax, tips, discounts)",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -557,8 +838,23 @@ def main():
     parser.add_argument("-t", "--threshold",
                         type=int,
                         help="Threshold for bar graph coloring (requires -d and -g)")
-    args = parser.parse_args()
+    parser.add_argument("-s", "--serve",
+                        action="store_true",
+                        help="Keep running and answer queries over HTTP on localhost")
+    parser.add_argument("--port",
+                        type=int,
+                        default=SERVE_PORT,
+                        help="Port for --serve mode")
+    parser.add_argument("--refresh",
+                        action="store_true",
+                        help="Refetch from Clover even when a cached copy is still valid")
+    return parser
+
+def print_breakdown(rows: Iterable[tuple[str, int]]) -> None:
+    """Print "• label: $amount" for (label, cents) pairs with a single write."""
+    sys.stdout.write("".join(f"• {label}: ${cents/100:,.2f}\n" for label, cents in rows))
 
+def validate_args(args: argparse.Namespace) -> None:
     # Validate -g flag usage
     if args.graph and not args.detail:
         sys.exit("❌  Graph mode (-g) requires detail mode (-d)")
@@ -572,13 +868,12 @@ def main():
         if args.threshold < 0:
             sys.exit("❌  Threshold (-t) must be a non-negative integer.")
 
-    cfg = load_cfg(CONFIG_FILE)
-
+def serve_one(args: argparse.Namespace, cfg: dict) -> None:
     if args.list:
         list_resource(cfg, args.list)
         return
 
-    start_ms, end_ms, sd, ed, range_type = window(args.range)
+    _, _, sd, ed, range_type = window(args.range)
 
     def export_csv(data, headers, filename):
         with open(filename, 'w', newline='') as csvfile:
@@ -589,14 +884,15 @@ def main():
         print(f"\n✅  Exported breakdown to {filename}")
 
     if args.query == "discounts":
-        orders = get_orders(cfg, start_ms, end_ms)
         if args.detail:
-            disc_map = build_discount_map(cfg)
+            orders, disc_map = fetch_concurrently(
+                (get_orders, cfg, sd, ed),
+                (build_discount_map, cfg),
+            )
             breakdown = discounts_breakdown(orders, disc_map)
             print("\nBreakdown by discount:")
             if breakdown:
-                for name, cents in sorted(breakdown.items()):
-                    print(f"• {name}: ${cents/100:,.2f}")
+                print_breakdown(sorted(breakdown.items()))
                 # Export to CSV if requested
                 if args.output:
                     export_csv(
@@ -610,27 +906,40 @@ def main():
             else:
                 print("• No discounts recorded")
             return
+        orders = get_orders(cfg, sd, ed)
         cents, label = total_discounts_cents(orders), "Total discounts"
     else:
-        payments = get_payments(cfg, start_ms, end_ms)
+        if args.query == "tips" and args.detail:
+            payments, emp_map = fetch_concurrently(
+                (get_payments, cfg, sd, ed, PAYMENT_EXPANDS["tips_detail"]),
+                (build_employee_map, cfg),
+            )
+        else:
+            payments, emp_map = get_payments(cfg, sd, ed, PAYMENT_EXPANDS[args.query]), None
+
+        # One pass over the payments yields the totals and whichever breakdown -d needs
+        by = None
+        if args.detail and args.query == "sales":
+            by = {"day": "hour", "range": "day", "year": "month"}[range_type]
+        elif args.detail and args.query == "tips":
+            by = "employee"
+        agg = aggregate(payments, by=by, start=sd, end=ed, employee_map=emp_map)
+
         if args.query == "sales":
-            cents, label = net_sales_cents(payments), "Net sales"
+            cents, label = agg.gross - agg.tax - agg.refunds, "Net sales"
             if args.detail:
                 if range_type == "day":
                     # Single day - show hourly breakdown
-                    hourly_breakdown = sales_by_hour(payments, sd)
+                    hourly_breakdown = agg.per_hour
                     print(f"\nHourly sales breakdown for {sd.strftime('%Y-%m-%d')}:" )
                     if hourly_breakdown:
-                        for hour in sorted(hourly_breakdown.keys()):
-                            if hour == 24:
-                                time_label = "12:00 AM"
-                            elif hour == 12:
-                                time_label = "12:00 PM"
-                            elif hour > 12:
-                                time_label = f"{hour-12}:00 PM"
-                            else:
-                                time_label = f"{hour}:00 AM"
-                            print(f"• {time_label}: ${hourly_breakdown[hour]/100:,.2f}")
+                        print_breakdown(
+                            ("12:00 AM" if hour == 24 else
+                             "12:00 PM" if hour == 12 else
+                             f"{hour-12}:00 PM" if hour > 12 else f"{hour}:00 AM",
+                             hourly_breakdown[hour])
+                            for hour in sorted(hourly_breakdown.keys())
+                        )
                         # Export to CSV if requested
                         if args.output:
                             export_csv(
@@ -663,12 +972,11 @@ def main():
                     return
                 elif range_type == "range":
                     # Date range - show daily breakdown
-                    daily_breakdown = sales_by_day(payments, sd, ed)
+                    daily_breakdown = agg.per_day
                     date_lbl = sd.strftime("%Y-%m-%d") if sd == ed else f"{sd:%Y-%m-%d} → {ed:%Y-%m-%d}"
                     print(f"\nDaily sales breakdown for {date_lbl}:")
                     if daily_breakdown:
-                        for day in sorted(daily_breakdown.keys()):
-                            print(f"• {day.strftime('%Y-%m-%d')}: ${daily_breakdown[day]/100:,.2f}")
+                        print_breakdown((f"{day:%Y-%m-%d}", daily_breakdown[day]) for day in sorted(daily_breakdown.keys()))
                         # Export to CSV if requested
                         if args.output:
                             export_csv(
@@ -688,12 +996,13 @@ def main():
                     return
                 elif range_type == "year":
                     # Year - show monthly breakdown
-                    monthly_breakdown = sales_by_month(payments, sd.year)
+                    monthly_breakdown = agg.per_month
                     print(f"\nMonthly sales breakdown for {sd.year}:")
                     if monthly_breakdown:
-                        for month in sorted(monthly_breakdown.keys()):
-                            month_name = calendar.month_name[month]
-                            print(f"• {month_name}: ${monthly_breakdown[month]/100:,.2f}")
+                        print_breakdown(
+                            (calendar.month_name[month], monthly_breakdown[month])
+                            for month in sorted(monthly_breakdown.keys())
+                        )
                         # Export to CSV if requested
                         if args.output:
                             export_csv(
@@ -712,16 +1021,14 @@ def main():
                         print("• No sales recorded")
                     return
         elif args.query == "tax":
-            cents, label = total_tax_cents(payments), "Total tax"
+            cents, label = agg.tax, "Total tax"
         elif args.query == "tips":
-            cents, label = total_tips_cents(payments), "Total tips"
+            cents, label = agg.tips, "Total tips"
             if args.detail:
-                emp_map = build_employee_map(cfg)
-                breakdown = tips_by_employee(payments, emp_map)
+                breakdown = agg.per_employee
                 print("\nBreakdown by employee:")
                 if breakdown:
-                    for name, cents in sorted(breakdown.items()):
-                        print(f"• {name}: ${cents/100:,.2f}")
+                    print_breakdown(sorted(breakdown.items()))
                     # Export to CSV if requested
                     if args.output:
                         export_csv(
@@ -741,5 +1048,74 @@ def main():
     date_lbl = sd.strftime("%Y-%m-%d") if sd == ed else f"{sd:%Y-%m-%d} → {ed:%Y-%m-%d}"
     print(f"{label} (12 p.m.–midnight CT) for {date_lbl}: ${abs(cents)/100:,.2f}")
 
+def serve(cfg: dict, parser: argparse.ArgumentParser, port: int) -> None:
+    """Answer queries over HTTP so repeated calls reuse a warm interpreter and session.
+
+    GET /<query>?range=...&detail=1   e.g. /sales?range=today, /tips?range=week&detail=1
+    GET /list/<resource>              e.g. /list/employees
+    The response body is the same text the CLI would print.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlsplit(self.path)
+            qs = parse_qs(url.query)
+            parts = url.path.strip("/").split("/")
+            if len(parts) == 2 and parts[0] == "list":
+                argv = ["-l", parts[1]]
+            else:
+                argv = ["-q", parts[0] or "sales", "-r", qs.get("range", ["today"])[0]]
+                if qs.get("detail", ["0"])[0] not in ("", "0", "false"):
+                    argv.append("-d")
+
+            status, out = 200, io.StringIO()
+            try:
+                with redirect_stdout(out):
+                    args = parser.parse_args(argv)
+                    validate_args(args)
+                    serve_one(args, cfg)
+            except SystemExit as ex:
+                status = 400
+                print(ex.code if isinstance(ex.code, str) else "❌  Bad request", file=out)
+            except requests.RequestException as ex:
+                status = 502
+                print(f"❌  Clover request failed: {ex}", file=out)
+            except Exception as ex:
+                status = 500
+                print(f"❌  Internal error: {type(ex).__name__}: {ex}", file=out)
+
+            body = out.getvalue().encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "text/plain; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    # Single-threaded on purpose: output is captured by swapping sys.stdout
+    server = HTTPServer(("127.0.0.1", port), Handler)
+    print(f"Serving Clover metrics on http://127.0.0.1:{port}/ (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+    validate_args(args)
+
+    cfg = load_cfg(CONFIG_FILE)
+    CACHE.revalidate = args.refresh
+
+    if args.serve:
+        serve(cfg, parser, args.port)
+    else:
+        serve_one(args, cfg)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        CACHE.wait()
+        SESSION.close()
\ No newline at end of file